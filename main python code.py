@@ -1,9 +1,54 @@
+import atexit
+import contextlib
+import json
 import os
 import pickle
+import time
+import weakref
 from abc import ABC, abstractmethod
-from datetime import date, datetime
+from dataclasses import dataclass, replace
+from datetime import date
 from enum import Enum
-from typing import List, Optional
+from typing import Any, List, Optional
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # Price reports fall back to summing ticket objects
+    np = None
+
+
+# Array kernels
+_total_kernel = None  # Chosen on first use, so Numba is only imported when a report needs it
+
+
+def _loop_total(prices, mults):
+    """Sum of prices[i] * mults[i], as a single loop for Numba to compile"""
+    total = 0.0
+    for i in range(prices.shape[0]):
+        total += prices[i] * mults[i]
+    return total
+
+
+def _dot_total(prices, mults):
+    """Sum of prices[i] * mults[i]"""
+    return np.dot(prices, mults)
+
+
+def _total(prices, mults):
+    """Sum of prices[i] * mults[i], compiled with Numba when it is installed"""
+    global _total_kernel
+    if _total_kernel is None:
+        try:
+            from numba import njit
+            _total_kernel = njit(cache=True)(_loop_total)
+        except ImportError:  # Array totals fall back to NumPy's dot product
+            _total_kernel = _dot_total
+    return _total_kernel(prices, mults)
 
 
 # Enum Types
@@ -25,227 +70,413 @@ class PaymentMethod(Enum):
     DIGITAL_WALLET = "Digital Wallet"
 
 
+# Pickle helpers
+def _legacy_state(state: dict, fields: tuple) -> tuple:
+    """Order the name-mangled attributes pickled by the original classes as a state tuple"""
+    values = {key.rsplit('__', 1)[-1]: value for key, value in state.items()}
+    return tuple(values[field] for field in fields)
+
+
+_TICKET_FIELDS = ('ticket_id', 'price', 'event_date', 'venue_section', 'is_used', 'created_by')
+
+
+# Immutable ticket details
+@dataclass(frozen=True, slots=True)
+class TicketSpec:
+    """Identity and pricing inputs of a ticket; setters swap in an updated copy"""
+    ticket_id: str
+    base_price: float
+    event_date: date
+    venue_section: str
+    category: Any = None  # RaceCategory for single race tickets
+
+
 # Abstract Ticket Class
 class Ticket(ABC):
-    def __init__(self, ticket_id: str, price: float, event_date: date, venue_section: str):
-        self.__ticket_id = ticket_id  # Private attribute
-        self.__price = price  # Private attribute
-        self.__event_date = event_date  # Private attribute
-        self.__venue_section = venue_section  # Private attribute
-        self.__is_used = False  # Private attribute
-        self.__created_by = None  # Private attribute for admin reference
+    __slots__ = ('_spec', '_is_used', '_created_by', '_multiplier', '_price_watchers')
+
+    def __init__(self, ticket_id: str, price: float, event_date: date, venue_section: str,
+                 category: Any = None):
+        self._spec = TicketSpec(ticket_id, price, event_date, venue_section, category)  # Protected attribute
+        self._is_used = False  # Protected attribute
+        self._created_by = None  # Protected attribute for admin reference
+        self._multiplier = 1.0  # Protected attribute, set by subclasses from their pricing rules
+        self._price_watchers = []  # Protected attribute, repriced-ID sets of the systems mirroring this price
 
     # Getters and setters
+    def get_spec(self) -> TicketSpec:
+        return self._spec
+
     def get_ticket_id(self) -> str:
-        return self.__ticket_id
+        return self._spec.ticket_id
 
     def set_ticket_id(self, ticket_id: str) -> None:
-        self.__ticket_id = ticket_id
+        self._spec = replace(self._spec, ticket_id=ticket_id)
 
-    def get_price(self) -> float:
-        return self.__price
+    @property
+    def price(self) -> float:
+        return self._spec.base_price
 
-    def set_price(self, price: float) -> None:
+    @price.setter
+    def price(self, price: float) -> None:
         if price < 0:
             raise ValueError("Price cannot be negative")
-        self.__price = price
+        self._spec = replace(self._spec, base_price=price)
+        self._mark_repriced()
+
+    def get_price_multiplier(self) -> float:
+        return self._multiplier
 
     def get_event_date(self) -> date:
-        return self.__event_date
+        return self._spec.event_date
 
     def set_event_date(self, event_date: date) -> None:
-        self.__event_date = event_date
+        self._spec = replace(self._spec, event_date=event_date)
 
     def get_venue_section(self) -> str:
-        return self.__venue_section
+        return self._spec.venue_section
 
     def set_venue_section(self, venue_section: str) -> None:
-        self.__venue_section = venue_section
+        self._spec = replace(self._spec, venue_section=venue_section)
 
     def is_used(self) -> bool:
-        return self.__is_used
+        return self._is_used
 
     def set_used(self, is_used: bool) -> None:
-        self.__is_used = is_used
+        self._is_used = is_used
 
     def get_created_by(self):
-        return self.__created_by
+        return self._created_by
 
     def set_created_by(self, admin) -> None:
-        self.__created_by = admin
+        self._created_by = admin
+
+    def _watch_price(self, repriced: set) -> None:
+        """Add this ticket's ID to a repriced set whenever its price changes (protected method)"""
+        if not any(watcher is repriced for watcher in self._price_watchers):
+            self._price_watchers.append(repriced)
+
+    def _mark_repriced(self) -> None:
+        """Record a price change in every watching set (protected method)"""
+        for repriced in self._price_watchers:
+            repriced.add(self._spec.ticket_id)
 
     @abstractmethod
     def calculate_price(self) -> float:
         """Calculate the final price of the ticket, must be implemented by subclasses"""
         pass
 
+    # Serialization
+    def to_dict(self) -> dict:
+        """Return the ticket as plain data; the creator is referenced by username"""
+        return {
+            'ticket_id': self._spec.ticket_id,
+            'price': self._spec.base_price,
+            'event_date': self._spec.event_date.isoformat(),
+            'venue_section': self._spec.venue_section,
+            'is_used': self._is_used,
+            'created_by': self._created_by.get_username() if self._created_by else None,
+        }
+
+    @staticmethod
+    def from_dict(data: dict, users: dict) -> 'Ticket':
+        """Rebuild a ticket of the right subclass from to_dict output"""
+        event_date = date.fromisoformat(data['event_date'])
+
+        if data['type'] == "SingleRace":
+            ticket = SingleRaceTicket(data['ticket_id'], data['price'], event_date, data['venue_section'],
+                                      data['race_name'], RaceCategory(data['race_category']))
+        elif data['type'] == "Season":
+            race_dates = [date.fromisoformat(race_date) for race_date in data['race_dates']]
+            ticket = SeasonTicket(data['ticket_id'], data['price'], event_date, data['venue_section'],
+                                  data['season_year'], data['included_races'], race_dates)
+        else:
+            raise ValueError(f"Invalid ticket type: {data['type']}")
+
+        ticket.set_used(data['is_used'])
+        ticket.set_created_by(users.get(data['created_by']))
+        return ticket
+
+    # Pickle support
+    def __getstate__(self) -> tuple:
+        spec = self._spec
+        return (spec.ticket_id, spec.base_price, spec.event_date, spec.venue_section,
+                self._is_used, self._created_by)
+
+    def __setstate__(self, state: tuple) -> None:
+        self._spec = TicketSpec(*state[:4])
+        self._is_used, self._created_by = state[4:]
+        self._price_watchers = []  # Systems watch the ticket again when they index it
+
     def __str__(self) -> str:
-        return f"Ticket ID: {self.__ticket_id}, Price: ${self.__price}, Date: {self.__event_date}, Section: {self.__venue_section}"
+        spec = self._spec
+        return f"Ticket ID: {spec.ticket_id}, Price: ${spec.base_price}, Date: {spec.event_date}, Section: {spec.venue_section}"
 
 
 # SingleRaceTicket Class
 class SingleRaceTicket(Ticket):
+    __slots__ = ('_race_name',)
+
     def __init__(self, ticket_id: str, price: float, event_date: date, venue_section: str,
                  race_name: str, race_category: RaceCategory):
-        super().__init__(ticket_id, price, event_date, venue_section)
-        self.__race_name = race_name  # Private attribute
-        self.__race_category = race_category  # Private attribute using enum
+        # The race category is held in the ticket spec
+        super().__init__(ticket_id, price, event_date, venue_section, race_category)
+        self._race_name = race_name  # Protected attribute
+        self._multiplier = self._category_multiplier(race_category)
 
     # Getters and setters
     def get_race_name(self) -> str:
-        return self.__race_name
+        return self._race_name
 
     def set_race_name(self, race_name: str) -> None:
-        self.__race_name = race_name
+        self._race_name = race_name
 
     def get_race_category(self) -> RaceCategory:
-        return self.__race_category
+        return self._spec.category
 
     def set_race_category(self, race_category: RaceCategory) -> None:
-        self.__race_category = race_category
+        self._spec = replace(self._spec, category=race_category)
+        self._multiplier = self._category_multiplier(race_category)
+        self._mark_repriced()
+
+    @staticmethod
+    def _category_multiplier(race_category: RaceCategory) -> float:
+        """Price multiplier for a race category (protected method)"""
+        if race_category == RaceCategory.PREMIUM:
+            return 1.2  # 20% premium
+        elif race_category == RaceCategory.STANDARD:
+            return 1.0
+        else:  # ECONOMY
+            return 0.9  # 10% discount
 
     def calculate_price(self) -> float:
         """Calculate final price based on race category"""
-        base_price = self.get_price()
-        if self.__race_category == RaceCategory.PREMIUM:
-            return base_price * 1.2  # 20% premium
-        elif self.__race_category == RaceCategory.STANDARD:
-            return base_price
-        else:  # ECONOMY
-            return base_price * 0.9  # 10% discount
+        return self._spec.base_price * self._multiplier
+
+    # Serialization
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data['type'] = "SingleRace"
+        data['race_name'] = self._race_name
+        data['race_category'] = self._spec.category.value
+        return data
+
+    # Pickle support
+    def __getstate__(self) -> tuple:
+        return super().__getstate__() + (self._race_name, self._spec.category.value)
+
+    def __setstate__(self, state: tuple) -> None:
+        if isinstance(state, dict):
+            state = _legacy_state(state, _TICKET_FIELDS + ('race_name', 'race_category'))
+        super().__setstate__(state[:-2])
+        self._race_name = state[-2]
+        race_category = RaceCategory(state[-1])
+        self._spec = replace(self._spec, category=race_category)
+        self._multiplier = self._category_multiplier(race_category)
 
     def __str__(self) -> str:
-        return f"{super().__str__()}, Race: {self.__race_name}, Category: {self.__race_category.value}"
+        return f"{super().__str__()}, Race: {self._race_name}, Category: {self._spec.category.value}"
 
 
 # SeasonTicket Class
 class SeasonTicket(Ticket):
+    __slots__ = ('_season_year', '_included_races', '_race_dates')
+
     def __init__(self, ticket_id: str, price: float, event_date: date, venue_section: str,
                  season_year: int, included_races: List[str], race_dates: List[date] = None):
         # For SeasonTicket, event_date represents season start date
         super().__init__(ticket_id, price, event_date, venue_section)
-        self.__season_year = season_year  # Private attribute
-        self.__included_races = included_races  # Private attribute
-        self.__race_dates = race_dates if race_dates else []  # Private attribute
+        self._season_year = season_year  # Protected attribute
+        self._included_races = list(included_races)  # Protected attribute, copied so the discount stays in sync
+        self._multiplier = self._discount_multiplier(len(included_races))
+        self._race_dates = race_dates if race_dates else []  # Protected attribute
 
     # Getters and setters
     def get_season_year(self) -> int:
-        return self.__season_year
+        return self._season_year
 
     def set_season_year(self, season_year: int) -> None:
-        self.__season_year = season_year
+        self._season_year = season_year
 
     def get_included_races(self) -> List[str]:
-        return self.__included_races
+        """Get a copy of the included races; use set_included_races to change them"""
+        return list(self._included_races)
 
     def set_included_races(self, included_races: List[str]) -> None:
-        self.__included_races = included_races
+        self._included_races = list(included_races)
+        self._multiplier = self._discount_multiplier(len(included_races))
+        self._mark_repriced()
 
     def get_race_dates(self) -> List[date]:
-        return self.__race_dates
+        return self._race_dates
 
     def set_race_dates(self, race_dates: List[date]) -> None:
-        self.__race_dates = race_dates
-
-    def calculate_price(self) -> float:
-        """Calculate final price based on number of included races"""
-        base_price = self.get_price()
-        num_races = len(self.__included_races)
+        self._race_dates = race_dates
 
+    @staticmethod
+    def _discount_multiplier(num_races: int) -> float:
+        """Price multiplier for the number of included races (protected method)"""
         if num_races >= 15:
-            return base_price * 0.7  # 30% discount for 15+ races
+            return 0.7  # 30% discount for 15+ races
         elif num_races >= 10:
-            return base_price * 0.8  # 20% discount for 10-14 races
+            return 0.8  # 20% discount for 10-14 races
         elif num_races >= 5:
-            return base_price * 0.9  # 10% discount for 5-9 races
+            return 0.9  # 10% discount for 5-9 races
         else:
-            return base_price  # No discount for less than 5 races
+            return 1.0  # No discount for less than 5 races
+
+    def calculate_price(self) -> float:
+        """Calculate final price based on number of included races"""
+        return self._spec.base_price * self._multiplier
+
+    # Serialization
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data['type'] = "Season"
+        data['season_year'] = self._season_year
+        data['included_races'] = self._included_races
+        data['race_dates'] = [race_date.isoformat() for race_date in self._race_dates]
+        return data
+
+    # Pickle support
+    def __getstate__(self) -> tuple:
+        return super().__getstate__() + (self._season_year, self._included_races, self._race_dates)
+
+    def __setstate__(self, state: tuple) -> None:
+        if isinstance(state, dict):
+            state = _legacy_state(state, _TICKET_FIELDS + ('season_year', 'included_races', 'race_dates'))
+        super().__setstate__(state[:-3])
+        self._season_year, self._included_races, self._race_dates = state[-3:]
+        self._multiplier = self._discount_multiplier(len(self._included_races))
 
     def __str__(self) -> str:
-        races_str = ", ".join(self.__included_races) if self.__included_races else "None"
-        return f"{super().__str__()}, Year: {self.__season_year}, Races: {races_str}"
+        races_str = ", ".join(self._included_races) if self._included_races else "None"
+        return f"{super().__str__()}, Year: {self._season_year}, Races: {races_str}"
 
 
 # User Class
 class User:
+    __slots__ = ('_user_id', '_username', '_password', '_email', '_phone_number', '_orders')
+    _USER_FIELDS = ('user_id', 'username', 'password', 'email', 'phone_number', 'orders')
+
     def __init__(self, user_id: str, username: str, password: str, email: str, phone_number: str = None):
-        self.__user_id = user_id  # Private attribute
-        self.__username = username  # Private attribute
-        self.__password = password  # Private attribute
-        self.__email = email  # Private attribute
-        self.__phone_number = phone_number  # Private attribute
-        self.__orders = []  # Private attribute for bidirectional relationship
+        self._user_id = user_id  # Protected attribute
+        self._username = username  # Protected attribute
+        self._password = password  # Protected attribute
+        self._email = email  # Protected attribute
+        self._phone_number = phone_number  # Protected attribute
+        self._orders = []  # Protected attribute for bidirectional relationship
 
     # Getters and setters
     def get_user_id(self) -> str:
-        return self.__user_id
+        return self._user_id
 
     def set_user_id(self, user_id: str) -> None:
-        self.__user_id = user_id
+        self._user_id = user_id
 
     def get_username(self) -> str:
-        return self.__username
+        return self._username
 
     def set_username(self, username: str) -> None:
-        self.__username = username
+        self._username = username
 
-    def get_password(self) -> str:
-        return self.__password
+    @property
+    def password(self) -> str:
+        return self._password
 
-    def set_password(self, password: str) -> None:
+    @password.setter
+    def password(self, password: str) -> None:
         if len(password) < 6:
             raise ValueError("Password must be at least 6 characters long")
-        self.__password = password
+        self._password = password
 
-    def get_email(self) -> str:
-        return self.__email
+    @property
+    def email(self) -> str:
+        return self._email
 
-    def set_email(self, email: str) -> None:
+    @email.setter
+    def email(self, email: str) -> None:
         if '@' not in email:
             raise ValueError("Invalid email format")
-        self.__email = email
+        self._email = email
 
     def get_phone_number(self) -> Optional[str]:
-        return self.__phone_number
+        return self._phone_number
 
     def set_phone_number(self, phone_number: str) -> None:
-        self.__phone_number = phone_number
+        self._phone_number = phone_number
 
     def get_orders(self) -> List:
-        return self.__orders
+        return self._orders
 
     def add_order(self, order) -> None:
-        self.__orders.append(order)
+        self._orders.append(order)
 
     def verify_password(self, password: str) -> bool:
-        return self.__password == password
+        return self._password == password
+
+    # Serialization
+    def to_dict(self) -> dict:
+        """Return the user as plain data; orders are referenced by ID"""
+        return {
+            'type': "User",
+            'user_id': self._user_id,
+            'username': self._username,
+            'password': self._password,
+            'email': self._email,
+            'phone_number': self._phone_number,
+            'orders': [order.get_order_id() for order in self._orders],
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> 'User':
+        """Rebuild a user or admin from to_dict output; orders are linked by BookingSystem"""
+        if data['type'] == "Admin":
+            return Admin(data['user_id'], data['username'], data['password'], data['email'],
+                         data['admin_level'], data['department'], data['phone_number'])
+        return User(data['user_id'], data['username'], data['password'], data['email'], data['phone_number'])
+
+    # Pickle support
+    def __getstate__(self) -> tuple:
+        return (self._user_id, self._username, self._password, self._email,
+                self._phone_number, self._orders)
+
+    def __setstate__(self, state: tuple) -> None:
+        if isinstance(state, dict):
+            state = _legacy_state(state, self._USER_FIELDS)
+        (self._user_id, self._username, self._password, self._email,
+         self._phone_number, self._orders) = state
 
     def __str__(self) -> str:
-        return f"User: {self.__username} ({self.__email})"
+        return f"User: {self._username} ({self._email})"
 
 
 # Admin Class
 class Admin(User):
+    __slots__ = ('_admin_level', '_department')
+
     def __init__(self, user_id: str, username: str, password: str, email: str,
                  admin_level: int, department: str, phone_number: str = None):
         super().__init__(user_id, username, password, email, phone_number)
-        self.__admin_level = admin_level  # Private attribute
-        self.__department = department  # Private attribute
+        self._admin_level = admin_level  # Protected attribute
+        self._department = department  # Protected attribute
 
     # Getters and setters
-    def get_admin_level(self) -> int:
-        return self.__admin_level
+    @property
+    def admin_level(self) -> int:
+        return self._admin_level
 
-    def set_admin_level(self, admin_level: int) -> None:
+    @admin_level.setter
+    def admin_level(self, admin_level: int) -> None:
         if admin_level < 1 or admin_level > 3:
             raise ValueError("Admin level must be between 1 and 3")
-        self.__admin_level = admin_level
+        self._admin_level = admin_level
 
     def get_department(self) -> str:
-        return self.__department
+        return self._department
 
     def set_department(self, department: str) -> None:
-        self.__department = department
+        self._department = department
 
     def create_ticket(self, ticket_type: str, ticket_id: str, price: float, event_date: date,
                       venue_section: str, **kwargs) -> Ticket:
@@ -275,121 +506,233 @@ class Admin(User):
 
         return ticket
 
+    # Serialization
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data['type'] = "Admin"
+        data['admin_level'] = self._admin_level
+        data['department'] = self._department
+        return data
+
+    # Pickle support
+    def __getstate__(self) -> tuple:
+        return super().__getstate__() + (self._admin_level, self._department)
+
+    def __setstate__(self, state: tuple) -> None:
+        if isinstance(state, dict):
+            state = _legacy_state(state, self._USER_FIELDS + ('admin_level', 'department'))
+        super().__setstate__(state[:-2])
+        self._admin_level, self._department = state[-2:]
+
     def __str__(self) -> str:
-        return f"Admin: {self.get_username()}, Level: {self.__admin_level}, Department: {self.__department}"
+        return f"Admin: {self.get_username()}, Level: {self._admin_level}, Department: {self._department}"
 
 
 # Order Class
 class Order:
+    __slots__ = ('_order_id', '_order_date', '_status', '_total_amount', '_payment_method', '_tickets',
+                 '_user_id', '_ticket_prices', '_running_total')
+
     def __init__(self, order_id: str, order_date: date, status: OrderStatus = OrderStatus.PENDING,
                  total_amount: float = 0.0, payment_method: PaymentMethod = None):
-        self.__order_id = order_id  # Private attribute
-        self.__order_date = order_date  # Private attribute
-        self.__status = status  # Private attribute using enum
-        self.__total_amount = total_amount  # Private attribute
-        self.__payment_method = payment_method  # Private attribute using enum
-        self.__tickets = []  # Private attribute for composition relationship
-        self.__user_id = None  # Private attribute to reference the user
+        self._order_id = order_id  # Protected attribute
+        self._order_date = order_date  # Protected attribute
+        self._status = status  # Protected attribute using enum
+        self._total_amount = total_amount  # Protected attribute
+        self._payment_method = payment_method  # Protected attribute using enum
+        self._tickets = {}  # Protected attribute for composition relationship, ticket_id -> Ticket
+        self._user_id = None  # Protected attribute to reference the user
+        self._ticket_prices = {}  # ticket_id -> price when the ticket was added
+        self._running_total = 0.0  # Sum of ticket_prices, kept up to date incrementally
 
     # Getters and setters
     def get_order_id(self) -> str:
-        return self.__order_id
+        return self._order_id
 
     def set_order_id(self, order_id: str) -> None:
-        self.__order_id = order_id
+        self._order_id = order_id
 
     def get_order_date(self) -> date:
-        return self.__order_date
+        return self._order_date
 
     def set_order_date(self, order_date: date) -> None:
-        self.__order_date = order_date
+        self._order_date = order_date
 
     def get_status(self) -> OrderStatus:
-        return self.__status
+        return self._status
 
     def set_status(self, status: OrderStatus) -> None:
-        self.__status = status
+        self._status = status
 
-    def get_total_amount(self) -> float:
-        return self.__total_amount
+    @property
+    def total_amount(self) -> float:
+        return self._total_amount
 
-    def set_total_amount(self, total_amount: float) -> None:
+    @total_amount.setter
+    def total_amount(self, total_amount: float) -> None:
         if total_amount < 0:
             raise ValueError("Total amount cannot be negative")
-        self.__total_amount = total_amount
+        self._total_amount = total_amount
 
     def get_payment_method(self) -> Optional[PaymentMethod]:
-        return self.__payment_method
+        return self._payment_method
 
     def set_payment_method(self, payment_method: PaymentMethod) -> None:
-        self.__payment_method = payment_method
+        self._payment_method = payment_method
 
     def get_user_id(self) -> str:
-        return self.__user_id
+        return self._user_id
 
     def set_user_id(self, user_id: str) -> None:
-        self.__user_id = user_id
+        self._user_id = user_id
 
     # Methods to manage tickets
     def add_ticket(self, ticket: Ticket) -> None:
         """Add a ticket to the order"""
-        if self.__status == OrderStatus.CONFIRMED:
+        if self._status == OrderStatus.CONFIRMED:
             raise ValueError("Cannot add tickets to a confirmed order")
 
-        self.__tickets.append(ticket)
-        self.__total_amount = self.calculate_total()
+        ticket_id = ticket.get_ticket_id()
+        price = ticket.calculate_price()
+        # Re-adding a ticket replaces it rather than counting it twice
+        self._running_total += price - self._ticket_prices.get(ticket_id, 0.0)
+        self._tickets[ticket_id] = ticket
+        self._ticket_prices[ticket_id] = price
+        self._total_amount = self._running_total
 
     def remove_ticket(self, ticket_id: str) -> bool:
         """Remove a ticket from the order"""
-        if self.__status == OrderStatus.CONFIRMED:
+        if self._status == OrderStatus.CONFIRMED:
             return False
 
-        for i, ticket in enumerate(self.__tickets):
-            if ticket.get_ticket_id() == ticket_id:
-                self.__tickets.pop(i)
-                self.__total_amount = self.calculate_total()
-                return True
+        if self._tickets.pop(ticket_id, None) is None:
+            return False
 
-        return False
+        self._running_total -= self._ticket_prices.pop(ticket_id)
+        if not self._tickets:
+            self._running_total = 0.0  # Drop accumulated rounding error
+        self._total_amount = self._running_total
+        return True
 
     def get_tickets(self) -> List[Ticket]:
         """Get all tickets in the order"""
-        return self.__tickets
+        return list(self._tickets.values())
 
     def calculate_total(self) -> float:
         """Calculate the total amount of the order"""
-        return sum(ticket.calculate_price() for ticket in self.__tickets)
+        return sum(ticket.calculate_price() for ticket in self._tickets.values())
 
     def confirm_order(self) -> bool:
         """Confirm the order if conditions are met"""
-        if not self.__tickets:
+        if not self._tickets:
             return False
 
-        if not self.__payment_method:
+        if not self._payment_method:
             return False
 
-        self.__status = OrderStatus.CONFIRMED
+        self._status = OrderStatus.CONFIRMED
         return True
 
     def cancel_order(self) -> bool:
         """Cancel the order if possible"""
-        # Check if any tickets are already used
-        for ticket in self.__tickets:
-            if ticket.is_used():
-                return False
+        if self._status == OrderStatus.CANCELLED:
+            return True
 
-        # Check if any event dates have passed
+        # Check in one pass that no ticket is used or for an event that has passed
         today = date.today()
-        for ticket in self.__tickets:
-            if ticket.get_event_date() < today:
+        for ticket in self._tickets.values():
+            if ticket.is_used() or ticket.get_event_date() < today:
                 return False
 
-        self.__status = OrderStatus.CANCELLED
+        self._status = OrderStatus.CANCELLED
         return True
 
+    # Serialization
+    def to_dict(self) -> dict:
+        """Return the order as plain data; tickets are referenced by ID"""
+        return {
+            'order_id': self._order_id,
+            'order_date': self._order_date.isoformat(),
+            'status': self._status.value,
+            'total_amount': self._total_amount,
+            'payment_method': self._payment_method.value if self._payment_method else None,
+            'tickets': list(self._tickets),
+            'user_id': self._user_id,
+        }
+
+    @staticmethod
+    def from_dict(data: dict, tickets: dict) -> 'Order':
+        """Rebuild an order from to_dict output, linking registered tickets"""
+        payment_method = PaymentMethod(data['payment_method']) if data['payment_method'] else None
+        order = Order(data['order_id'], date.fromisoformat(data['order_date']), payment_method=payment_method)
+        for ticket_id in data['tickets']:
+            if ticket_id in tickets:
+                order.add_ticket(tickets[ticket_id])
+
+        # Restore status and total last, as confirmed orders reject new tickets
+        order.set_status(OrderStatus(data['status']))
+        order.total_amount = data['total_amount']
+        order.set_user_id(data['user_id'])
+        return order
+
+    # Pickle support
+    def __getstate__(self) -> tuple:
+        # Tickets are pickled as objects, shared with the ticket store through the pickle memo.
+        # Their prices are stored too, as a ticket may not be restored yet when this state is set.
+        payment_method = self._payment_method.value if self._payment_method else None
+        return (self._order_id, self._order_date, self._status.value, self._total_amount,
+                payment_method, self._tickets, self._user_id, self._ticket_prices)
+
+    def __setstate__(self, state: tuple) -> None:
+        if isinstance(state, dict):
+            state = _legacy_state(state, ('order_id', 'order_date', 'status', 'total_amount',
+                                          'payment_method', 'tickets', 'user_id'))
+        (self._order_id, self._order_date, status, self._total_amount,
+         payment_method, tickets, self._user_id) = state[:7]
+        self._status = OrderStatus(status)
+        self._payment_method = PaymentMethod(payment_method) if payment_method else None
+
+        if isinstance(tickets, dict):
+            self._tickets = tickets
+            self._ticket_prices = state[7]
+        else:
+            # Older pickles hold a list of tickets or ticket IDs, resolved by _link_tickets
+            self._tickets = tickets
+            self._ticket_prices = {}
+        self._running_total = sum(self._ticket_prices.values())
+
+    def _link_tickets(self, tickets: dict) -> None:
+        """Resolve a ticket list restored from an older pickle against registered tickets (protected method)"""
+        if isinstance(self._tickets, dict):
+            return
+
+        linked = {}
+        for ticket in self._tickets:
+            ticket_id = ticket if isinstance(ticket, str) else ticket.get_ticket_id()
+            if ticket_id in tickets:
+                linked[ticket_id] = tickets[ticket_id]
+            elif not isinstance(ticket, str):
+                linked[ticket_id] = ticket
+        self._tickets = linked
+        self._ticket_prices = {ticket_id: ticket.calculate_price() for ticket_id, ticket in linked.items()}
+        self._running_total = sum(self._ticket_prices.values())
+
     def __str__(self) -> str:
-        return (f"Order #{self.__order_id}, Status: {self.__status.value}, "
-                f"Total: ${self.__total_amount:.2f}, Tickets: {len(self.__tickets)}")
+        return (f"Order #{self._order_id}, Status: {self._status.value}, "
+                f"Total: ${self._total_amount:.2f}, Tickets: {len(self._tickets)}")
+
+
+# Exit helpers
+def _call_at_exit(method) -> None:
+    """Call a bound method at interpreter exit, unless its object has been collected by then"""
+    method_ref = weakref.WeakMethod(method)
+
+    def hook():
+        live_method = method_ref()
+        if live_method is not None:
+            live_method()
+
+    atexit.register(hook)
 
 
 # BookingSystem Class with Pickle Persistence
@@ -399,20 +742,38 @@ class BookingSystem:
         self.__version = version  # Private attribute
         self._database = None  # Protected attribute
         self._log_file = "booking_system.log"  # Protected attribute
-
-        # Aggregation relationships
-        self.__users = {}  # username -> User
-        self.__admins = {}  # username -> Admin (also in users)
-        self.__tickets = {}  # ticket_id -> Ticket
-        self.__orders = {}  # order_id -> Order
+        self._log_fp = self._open_log()  # Protected attribute, kept open for the system's lifetime
+        self._log_last_sec = 0  # Protected attribute, second of the cached log timestamp
+        self._log_last_ts = ""  # Protected attribute, cached log timestamp for that second
+
+        # Aggregation relationships, loaded from the state file on first access
+        self.__users_cache = None  # username -> User
+        self._admin_view = None  # Cached list of the Admin instances in users, rebuilt on demand
+        self.__tickets_cache = None  # ticket_id -> Ticket
+        self.__orders_cache = None  # order_id -> Order
+        self.__order_seq = 0  # Last order number issued, persisted with the orders
+
+        # Ticket prices mirrored as arrays for bulk reports, when NumPy is available
+        self._ticket_index = {}  # ticket_id -> row in the price arrays
+        self._price_array = np.zeros(0) if np is not None else None
+        self._multiplier_array = np.zeros(0) if np is not None else None
+        self._repriced_ids = set()  # IDs of indexed tickets repriced since their rows were written
+
+        # Stores modified since the last write
+        self._dirty = {'users': False, 'tickets': False, 'orders': False}
+        self._batch_depth = 0  # Nesting depth of batch() blocks
 
         # Data directory
         self._data_dir = "data"
         if not os.path.exists(self._data_dir):
             os.makedirs(self._data_dir)
+        self._state_file = os.path.join(self._data_dir, 'state.json')
+        self._pickle_file = os.path.join(self._data_dir, 'state.pkl')  # Written by earlier versions
+        self._legacy_files = {store: os.path.join(self._data_dir, f'{store}.pkl')  # Written by the original version
+                              for store in ('users', 'admins', 'tickets', 'orders')}
 
-        # Load data from files if they exist
-        self.load_data()
+        # Write any pending changes and close the log when the interpreter exits
+        self._register_exit_hooks()
 
     # Getters and setters
     def get_name(self) -> str:
@@ -427,25 +788,33 @@ class BookingSystem:
     def set_version(self, version: str) -> None:
         self.__version = version
 
+    # Lazily loaded stores
+    @property
+    def __users(self) -> dict:
+        if self.__users_cache is None:
+            self.load_data()
+        return self.__users_cache
+
+    @property
+    def __tickets(self) -> dict:
+        if self.__tickets_cache is None:
+            self.load_data()
+        return self.__tickets_cache
+
+    @property
+    def __orders(self) -> dict:
+        if self.__orders_cache is None:
+            self.load_data()
+        return self.__orders_cache
+
     # File operations
     def save_data(self) -> bool:
-        """Save all system data to pickle files"""
+        """Save all system data to a single JSON file"""
         try:
-            # Save users
-            with open(os.path.join(self._data_dir, 'users.pkl'), 'wb') as f:
-                pickle.dump(self.__users, f)
-
-            # Save admins
-            with open(os.path.join(self._data_dir, 'admins.pkl'), 'wb') as f:
-                pickle.dump(self.__admins, f)
+            self._atomic_write(self._state_file, self._serialize_state())
 
-            # Save tickets
-            with open(os.path.join(self._data_dir, 'tickets.pkl'), 'wb') as f:
-                pickle.dump(self.__tickets, f)
-
-            # Save orders
-            with open(os.path.join(self._data_dir, 'orders.pkl'), 'wb') as f:
-                pickle.dump(self.__orders, f)
+            for store in self._dirty:
+                self._dirty[store] = False
 
             self._write_log("All data saved successfully")
             return True
@@ -453,55 +822,212 @@ class BookingSystem:
             self._write_log(f"Error saving data: {e}")
             return False
 
+    def flush(self) -> bool:
+        """Save the system data if anything changed since the last write"""
+        if not any(self._dirty.values()):
+            return True
+        return self.save_data()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Group changes and flush them once when the outermost batch ends"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
     def load_data(self) -> bool:
-        """Load all system data from pickle files"""
+        """Load all system data from the state file"""
+        # Start from empty stores so a missing or unreadable file is only tried once
+        self.__users_cache, self.__tickets_cache, self.__orders_cache = {}, {}, {}
+        self._admin_view = None
+        self.__order_seq = 0
         try:
-            # Load users
-            users_path = os.path.join(self._data_dir, 'users.pkl')
-            if os.path.exists(users_path):
-                with open(users_path, 'rb') as f:
-                    self.__users = pickle.load(f)
-                self._write_log(f"Loaded {len(self.__users)} users")
-
-            # Load admins
-            admins_path = os.path.join(self._data_dir, 'admins.pkl')
-            if os.path.exists(admins_path):
-                with open(admins_path, 'rb') as f:
-                    self.__admins = pickle.load(f)
-                self._write_log(f"Loaded {len(self.__admins)} admins")
+            state_loaded = True
+            if os.path.exists(self._state_file):
+                with open(self._state_file, 'rb') as f:
+                    self._deserialize_state(f.read())
+            elif os.path.exists(self._pickle_file):
+                # Pickled state from earlier versions, converted on the next save
+                with open(self._pickle_file, 'rb') as f:
+                    state = pickle.load(f)
+                self._adopt_pickled_state(state['users'], {}, state['tickets'], state['orders'])
+            elif any(os.path.exists(path) for path in self._legacy_files.values()):
+                # Per-entity pickles from the original version, converted on the next save
+                stores = {}
+                for store, path in self._legacy_files.items():
+                    stores[store] = {}
+                    if os.path.exists(path):
+                        with open(path, 'rb') as f:
+                            stores[store] = pickle.load(f)
+                self._adopt_pickled_state(stores['users'], stores['admins'], stores['tickets'], stores['orders'])
             else:
-                # Create default admin if no admin data exists
-                if not self.__admins:
-                    self.create_admin(
-                        "ADM-001",
-                        "admin",
-                        "admin123",
-                        "admin@grandprix.com",
-                        3,  # Highest level
-                        "System Administration"
-                    )
-                    self._write_log("Created default admin account")
-
-            # Load tickets
-            tickets_path = os.path.join(self._data_dir, 'tickets.pkl')
-            if os.path.exists(tickets_path):
-                with open(tickets_path, 'rb') as f:
-                    self.__tickets = pickle.load(f)
-                self._write_log(f"Loaded {len(self.__tickets)} tickets")
-
-            # Load orders
-            orders_path = os.path.join(self._data_dir, 'orders.pkl')
-            if os.path.exists(orders_path):
-                with open(orders_path, 'rb') as f:
-                    self.__orders = pickle.load(f)
-                self._write_log(f"Loaded {len(self.__orders)} orders")
+                state_loaded = False
+
+            # Rebuilt even when nothing was loaded, to drop rows left from before the reload
+            self._rebuild_price_arrays()
+            if state_loaded:
+                self._write_log(f"Loaded {len(self.__users)} users, {len(self.get_admins())} admins, "
+                                f"{len(self.__tickets)} tickets, {len(self.__orders)} orders")
+
+            # Create default admin if no admin data exists
+            if not self.get_admins():
+                self.create_admin(
+                    "ADM-001",
+                    "admin",
+                    "admin123",
+                    "admin@grandprix.com",
+                    3,  # Highest level
+                    "System Administration"
+                )
+                self._write_log("Created default admin account")
 
             return True
         except Exception as e:
+            self._rebuild_price_arrays()  # Index whatever was loaded before the failure
             self._write_log(f"Error loading data: {e}")
             return False
 
     # Protected methods
+    def _atomic_write(self, path: str, payload: bytes) -> None:
+        """Replace a file's contents so readers never see a partial write (protected method)"""
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        finally:
+            # Only still there if the write or the replace failed
+            if os.path.exists(tmp_path):
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+
+        # Sync the directory so the rename survives a crash; Windows cannot open directories for this
+        if hasattr(os, 'O_DIRECTORY'):
+            dir_fd = os.open(os.path.dirname(path) or os.curdir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def _serialize_state(self) -> bytes:
+        """Encode all system data as JSON (protected method)"""
+        # Admins are rebuilt from users on load
+        state = {
+            'users': [user.to_dict() for user in self.__users.values()],
+            'tickets': [ticket.to_dict() for ticket in self.__tickets.values()],
+            'orders': [order.to_dict() for order in self.__orders.values()],
+            'order_seq': self.__order_seq,
+        }
+        if orjson is not None:
+            return orjson.dumps(state)
+        return json.dumps(state).encode('utf-8')
+
+    def _deserialize_state(self, payload: bytes) -> None:
+        """Rebuild users, tickets and orders from _serialize_state output (protected method)"""
+        state = orjson.loads(payload) if orjson is not None else json.loads(payload)
+
+        self.__users_cache = {}
+        for data in state['users']:
+            user = User.from_dict(data)
+            self.__users[user.get_username()] = user
+
+        self.__tickets_cache = {}
+        for data in state['tickets']:
+            ticket = Ticket.from_dict(data, self.__users)
+            self.__tickets[ticket.get_ticket_id()] = ticket
+
+        self.__orders_cache = {}
+        for data in state['orders']:
+            order = Order.from_dict(data, self.__tickets)
+            self.__orders[order.get_order_id()] = order
+
+        # State saved before the sequence was persisted falls back to the highest order number
+        self.__order_seq = state['order_seq'] if 'order_seq' in state else self._highest_order_number()
+
+        # Restore each user's order history
+        for data in state['users']:
+            user = self.__users[data['username']]
+            for order_id in data['orders']:
+                if order_id in self.__orders:
+                    user.add_order(self.__orders[order_id])
+
+    def _rebuild_price_arrays(self) -> None:
+        """Rebuild the price arrays from all registered tickets (protected method)"""
+        if np is None:
+            return
+
+        count = len(self.__tickets)
+        self._ticket_index = {ticket_id: idx for idx, ticket_id in enumerate(self.__tickets)}
+        self._price_array = np.fromiter((ticket.price for ticket in self.__tickets.values()),
+                                        dtype=float, count=count)
+        self._multiplier_array = np.fromiter((ticket.get_price_multiplier() for ticket in self.__tickets.values()),
+                                             dtype=float, count=count)
+        # A fresh set, so tickets indexed before the rebuild no longer report here
+        self._repriced_ids = set()
+        for ticket in self.__tickets.values():
+            ticket._watch_price(self._repriced_ids)
+
+    def _sync_price_arrays(self) -> None:
+        """Rewrite the rows of tickets repriced since they were indexed (protected method)"""
+        while self._repriced_ids:
+            ticket = self.__tickets.get(self._repriced_ids.pop())
+            if ticket is not None:
+                self._index_ticket(ticket)
+
+    def _index_ticket(self, ticket: Ticket) -> None:
+        """Store a ticket's base price and multiplier in the price arrays (protected method)"""
+        if np is None:
+            return
+
+        ticket_id = ticket.get_ticket_id()
+        idx = self._ticket_index.get(ticket_id)
+        if idx is None:
+            idx = len(self._ticket_index)
+            if idx == len(self._price_array):
+                # Grow geometrically so appends stay amortised O(1)
+                extra = max(16, idx)
+                self._price_array = np.concatenate((self._price_array, np.zeros(extra)))
+                self._multiplier_array = np.concatenate((self._multiplier_array, np.zeros(extra)))
+            self._ticket_index[ticket_id] = idx
+
+        self._price_array[idx] = ticket.price
+        self._multiplier_array[idx] = ticket.get_price_multiplier()
+        ticket._watch_price(self._repriced_ids)
+        self._repriced_ids.discard(ticket_id)
+
+    def _adopt_pickled_state(self, users: dict, admins: dict, tickets: dict, orders: dict) -> None:
+        """Take over stores unpickled from an older format and relink them (protected method)"""
+        for username, admin in admins.items():
+            users.setdefault(username, admin)
+        self.__users_cache, self.__tickets_cache, self.__orders_cache = users, tickets, orders
+        for order in orders.values():
+            order._link_tickets(tickets)
+        self.__order_seq = self._highest_order_number()
+
+        # Separately pickled stores hold their own copies of shared objects; a round trip through
+        # the ID-based state links every reference back to the stored instances
+        self._deserialize_state(self._serialize_state())
+        self._dirty['users'] = True
+
+    def _highest_order_number(self) -> int:
+        """Highest number among the ORD-<n> order IDs, or 0 (protected method)"""
+        numbers = [int(order_id[4:]) for order_id in self.__orders
+                   if order_id.startswith("ORD-") and order_id[4:].isdigit()]
+        return max(numbers, default=0)
+
+    def _next_order_id(self) -> str:
+        """Generate a unique order ID from the order sequence (protected method)"""
+        if self.__orders_cache is None:
+            self.load_data()  # Restores the saved sequence
+        self.__order_seq += 1
+        return "ORD-" + str(self.__order_seq)
+
     def _connect_database(self) -> bool:
         """Connect to the database (protected method)"""
         # Simulate database connection
@@ -509,14 +1035,31 @@ class BookingSystem:
         self._write_log("Database connected")
         return True
 
+    def _open_log(self):
+        """Open the log file for appending (protected method)"""
+        return open(self._log_file, 'a', buffering=1)  # Line buffered
+
+    def _close_log(self) -> None:
+        """Close the log file (protected method)"""
+        self._log_fp.close()
+
+    def _register_exit_hooks(self) -> None:
+        """Flush pending changes, then close the log, at interpreter exit (protected method)"""
+        # Exit hooks run last in, first out, so the close is registered first
+        _call_at_exit(self._close_log)
+        _call_at_exit(self.flush)
+
     def _write_log(self, message: str) -> None:
         """Write to the log file (protected method)"""
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_message = f"[{timestamp}] {message}\n"
+            # Format the timestamp at most once per wall-clock second
+            now = time.time()
+            sec = int(now)
+            if sec != self._log_last_sec:
+                self._log_last_ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+                self._log_last_sec = sec
 
-            with open(self._log_file, 'a') as f:
-                f.write(log_message)
+            self._log_fp.write(f"[{self._log_last_ts}] {message}\n")
 
             # Print to console as well
             print(f"LOG: {message}")
@@ -534,8 +1077,8 @@ class BookingSystem:
         self.__users[username] = user
         self._write_log(f"Created user: {username}")
 
-        # Save changes to file
-        self.save_data()
+        # Mark changes for the next flush
+        self._dirty['users'] = True
 
         return user
 
@@ -547,11 +1090,11 @@ class BookingSystem:
 
         admin = Admin(user_id, username, password, email, admin_level, department, phone_number)
         self.__users[username] = admin
-        self.__admins[username] = admin
+        self._admin_view = None
         self._write_log(f"Created admin: {username}")
 
-        # Save changes to file
-        self.save_data()
+        # Mark changes for the next flush
+        self._dirty['users'] = True
 
         return admin
 
@@ -561,7 +1104,14 @@ class BookingSystem:
 
     def get_admin(self, username: str) -> Optional[Admin]:
         """Get an admin by username"""
-        return self.__admins.get(username)
+        user = self.__users.get(username)
+        return user if isinstance(user, Admin) else None
+
+    def get_admins(self) -> List[Admin]:
+        """Get a copy of the list of all admins"""
+        if self._admin_view is None:
+            self._admin_view = [user for user in self.__users.values() if isinstance(user, Admin)]
+        return list(self._admin_view)
 
     # Ticket management
     def register_ticket(self, ticket: Ticket) -> None:
@@ -571,20 +1121,43 @@ class BookingSystem:
             raise ValueError(f"Ticket ID '{ticket_id}' already exists")
 
         self.__tickets[ticket_id] = ticket
+        self._index_ticket(ticket)
         self._write_log(f"Registered ticket: {ticket_id}")
 
-        # Save changes to file
-        self.save_data()
+        # Mark changes for the next flush
+        self._dirty['tickets'] = True
 
     def get_ticket(self, ticket_id: str) -> Optional[Ticket]:
         """Get a ticket by ID"""
         return self.__tickets.get(ticket_id)
 
+    def update_ticket(self, ticket: Ticket) -> None:
+        """Update an existing ticket in the system"""
+        ticket_id = ticket.get_ticket_id()
+        if ticket_id not in self.__tickets:
+            raise ValueError(f"Ticket '{ticket_id}' does not exist")
+
+        self.__tickets[ticket_id] = ticket
+        self._index_ticket(ticket)
+        self._write_log(f"Updated ticket: {ticket_id}")
+
+        # Mark changes for the next flush
+        self._dirty['tickets'] = True
+
+    def total_revenue(self) -> float:
+        """Total calculated price of all registered tickets"""
+        if np is None:
+            return sum(ticket.calculate_price() for ticket in self.__tickets.values())
+
+        count = len(self.__tickets)  # Also loads the tickets and their rows on first access
+        self._sync_price_arrays()
+        return float(_total(self._price_array[:count], self._multiplier_array[:count]))
+
     # Order management
     def create_order(self, user: User) -> Order:
         """Create a new order for a user"""
         # Generate a unique order ID
-        order_id = f"ORD-{len(self.__orders) + 1}"
+        order_id = self._next_order_id()
         order = Order(order_id, date.today())
         order.set_user_id(user.get_username())
 
@@ -596,8 +1169,8 @@ class BookingSystem:
 
         self._write_log(f"Created order: {order_id} for user: {user.get_username()}")
 
-        # Save changes to file
-        self.save_data()
+        # Mark changes for the next flush
+        self._dirty['orders'] = True
 
         return order
 
@@ -614,8 +1187,28 @@ class BookingSystem:
         self.__orders[order_id] = order
         self._write_log(f"Updated order: {order_id}")
 
-        # Save changes to file
-        self.save_data()
+        # Mark changes for the next flush
+        self._dirty['orders'] = True
+
+    # Pickle support
+    def __getstate__(self) -> dict:
+        # The open log handle cannot be pickled and is reopened on load
+        state = self.__dict__.copy()
+        del state['_log_fp']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._log_fp = self._open_log()
+        if self.__tickets_cache is not None:
+            self._rebuild_price_arrays()  # Unpickled tickets are not watched yet
+        self._register_exit_hooks()
+
+    def __del__(self) -> None:
+        # Exit hooks only hold weak references, so a system collected before exit saves here
+        if hasattr(self, '_dirty'):
+            self.flush()
+            self._close_log()
 
     def __str__(self) -> str:
         return (f"BookingSystem: {self.__name} v{self.__version}, "
@@ -666,63 +1259,65 @@ def main():
         print("2. CREATING TICKETS")
         print("-" * 80)
 
-        # Admin creates tickets
-        single_ticket = admin.create_ticket(
-            "SingleRace",
-            "TKT-001",
-            200.0,
-            date(2025, 6, 15),
-            "Main Grandstand",
-            race_name="Monaco Grand Prix",
-            race_category=RaceCategory.PREMIUM
-        )
-        system.register_ticket(single_ticket)
-        print(f"Single Race Ticket Created: {single_ticket}")
-        print(f"Base Price: ${single_ticket.get_price():.2f}")
-        print(f"Calculated Price: ${single_ticket.calculate_price():.2f}")
-        print()
-
-        season_ticket = admin.create_ticket(
-            "Season",
-            "TKT-002",
-            1000.0,
-            date(2025, 1, 1),  # Season start date
-            "VIP Lounge",
-            season_year=2025,
-            included_races=["Monaco", "Silverstone", "Monza", "Singapore", "Abu Dhabi"],
-            race_dates=[
-                date(2025, 5, 25),  # Monaco
-                date(2025, 7, 7),  # Silverstone
-                date(2025, 9, 1),  # Monza
-                date(2025, 9, 21),  # Singapore
-                date(2025, 12, 1)  # Abu Dhabi
-            ]
-        )
-        system.register_ticket(season_ticket)
-        print(f"Season Ticket Created: {season_ticket}")
-        print(f"Base Price: ${season_ticket.get_price():.2f}")
-        print(f"Calculated Price (with discount): ${season_ticket.calculate_price():.2f}")
-        print()
-
-        # 3. Order Processing
-        print("-" * 80)
-        print("3. PROCESSING ORDERS")
-        print("-" * 80)
-
-        # Create an order
-        order = system.create_order(user)
-        print(f"New Order Created: {order}")
-
-        # Add tickets to the order
-        order.add_ticket(single_ticket)
-        print(f"Added Single Race Ticket to order.")
-        print(f"Order Status: {order}")
-        system.update_order(order)  # Save the updated order
-
-        order.add_ticket(season_ticket)
-        print(f"Added Season Ticket to order.")
-        print(f"Order Status: {order}")
-        system.update_order(order)  # Save the updated order
+        # Create tickets and build the order as one batch, saved once at the end
+        with system.batch():
+            # Admin creates tickets
+            single_ticket = admin.create_ticket(
+                "SingleRace",
+                "TKT-001",
+                200.0,
+                date(2025, 6, 15),
+                "Main Grandstand",
+                race_name="Monaco Grand Prix",
+                race_category=RaceCategory.PREMIUM
+            )
+            system.register_ticket(single_ticket)
+            print(f"Single Race Ticket Created: {single_ticket}")
+            print(f"Base Price: ${single_ticket.price:.2f}")
+            print(f"Calculated Price: ${single_ticket.calculate_price():.2f}")
+            print()
+
+            season_ticket = admin.create_ticket(
+                "Season",
+                "TKT-002",
+                1000.0,
+                date(2025, 1, 1),  # Season start date
+                "VIP Lounge",
+                season_year=2025,
+                included_races=["Monaco", "Silverstone", "Monza", "Singapore", "Abu Dhabi"],
+                race_dates=[
+                    date(2025, 5, 25),  # Monaco
+                    date(2025, 7, 7),  # Silverstone
+                    date(2025, 9, 1),  # Monza
+                    date(2025, 9, 21),  # Singapore
+                    date(2025, 12, 1)  # Abu Dhabi
+                ]
+            )
+            system.register_ticket(season_ticket)
+            print(f"Season Ticket Created: {season_ticket}")
+            print(f"Base Price: ${season_ticket.price:.2f}")
+            print(f"Calculated Price (with discount): ${season_ticket.calculate_price():.2f}")
+            print()
+
+            # 3. Order Processing
+            print("-" * 80)
+            print("3. PROCESSING ORDERS")
+            print("-" * 80)
+
+            # Create an order
+            order = system.create_order(user)
+            print(f"New Order Created: {order}")
+
+            # Add tickets to the order
+            order.add_ticket(single_ticket)
+            print(f"Added Single Race Ticket to order.")
+            print(f"Order Status: {order}")
+            system.update_order(order)  # Save the updated order
+
+            order.add_ticket(season_ticket)
+            print(f"Added Season Ticket to order.")
+            print(f"Order Status: {order}")
+            system.update_order(order)  # Save the updated order
         print()
 
         # Process payment and confirm order
@@ -760,10 +1355,7 @@ def main():
 
         # Show that data is saved
         print("\nAll data has been saved to the following files:")
-        print(f"- {os.path.join(system._data_dir, 'users.pkl')}")
-        print(f"- {os.path.join(system._data_dir, 'admins.pkl')}")
-        print(f"- {os.path.join(system._data_dir, 'tickets.pkl')}")
-        print(f"- {os.path.join(system._data_dir, 'orders.pkl')}")
+        print(f"- {system._state_file}")
         print(f"- {system._log_file}")
 
         print("\nYou can restart the application and the data will be loaded from these files.")